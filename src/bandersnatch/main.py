@@ -4,9 +4,12 @@ import logging
 import logging.config
 import shutil
 import sys
+from collections.abc import Coroutine
 from configparser import ConfigParser
+from functools import cache
 from pathlib import Path
 from tempfile import gettempdir
+from typing import Any
 
 import bandersnatch.configuration
 import bandersnatch.delete
@@ -17,15 +20,20 @@ import bandersnatch.verify
 from bandersnatch.config.exceptions import ConfigError, ConfigFileNotFound
 from bandersnatch.storage import storage_backend_plugins
 
-# See if we have uvloop and use if so
-try:
-    import uvloop
+logger = logging.getLogger(__name__)  # pylint: disable=C0103
+TMP_STATUS_FILE = Path(gettempdir()) / "status"
 
-    uvloop.install()
-except ImportError:
-    pass
 
-logger = logging.getLogger(__name__)  # pylint: disable=C0103
+def _run(coro: Coroutine[Any, Any, int]) -> int:
+    # See if we have uvloop (>= 0.18 has uvloop.run) and use if so
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if not hasattr(uvloop, "run"):
+        return asyncio.run(coro)
+    result: int = uvloop.run(coro)
+    return result
 
 
 def _delete_parser(subparsers: argparse._SubParsersAction) -> None:
@@ -120,8 +128,10 @@ def _sync_parser(subparsers: argparse._SubParsersAction) -> None:
     )
 
 
+@cache
 def _make_parser() -> argparse.ArgumentParser:
     # Separated so sphinx-argparse-cli can do its auto documentation magic.
+    # Cached as the parser holds no state between parse_args() calls.
     parser = argparse.ArgumentParser(
         description="PyPI PEP 381 mirroring client.", prog="bandersnatch"
     )
@@ -152,12 +162,16 @@ def _make_parser() -> argparse.ArgumentParser:
 
 async def async_main(args: argparse.Namespace, config: ConfigParser) -> int:
     if args.op.lower() == "delete":
-        allow_upstream_serial_mismatch = config.getboolean("mirror", "allow-upstream-serial-mismatch", fallback=False)
+        mirror_config = config["mirror"]
+        timeout = mirror_config.getfloat("timeout")
+        assert timeout is not None, "[mirror] is missing a required option"
         async with bandersnatch.master.Master(
-            config.get("mirror", "master"),
-            config.getfloat("mirror", "timeout"),
-            config.getfloat("mirror", "global-timeout", fallback=None),
-            allow_upstream_serial_mismatch=allow_upstream_serial_mismatch,
+            mirror_config["master"],
+            timeout,
+            mirror_config.getfloat("global-timeout", fallback=None),
+            allow_upstream_serial_mismatch=mirror_config.getboolean(
+                "allow-upstream-serial-mismatch", fallback=False
+            ),
         ) as master:
             return await bandersnatch.delete.delete_packages(config, args, master)
     elif args.op.lower() == "verify":
@@ -173,21 +187,24 @@ async def async_main(args: argparse.Namespace, config: ConfigParser) -> int:
             storage_plugin.PATH_BACKEND(config.get("mirror", "directory")) / "status"
         )
         if status_file.exists():
-            tmp_status_file = Path(gettempdir()) / "status"
+            tmp_status_file = TMP_STATUS_FILE
             try:
                 shutil.move(str(status_file), tmp_status_file)
                 logger.debug(
                     "Force bandersnatch to check everything against the master PyPI"
-                    + f" - status file moved to {tmp_status_file}"
+                    + " - status file moved to %s",
+                    tmp_status_file,
                 )
             except OSError as e:
                 logger.error(
-                    f"Could not move status file ({status_file} to "
-                    + f" {tmp_status_file}): {e}"
+                    "Could not move status file (%s to %s): %s",
+                    status_file,
+                    tmp_status_file,
+                    e,
                 )
         else:
             logger.info(
-                f"No status file to move ({status_file}) - Full sync will occur"
+                "No status file to move (%s) - Full sync will occur", status_file
             )
 
     return await bandersnatch.mirror.mirror(config)
@@ -209,7 +226,9 @@ def main(loop: asyncio.AbstractEventLoop | None = None) -> int:
         logger.info("Reading configuration file '%s'", config_path)
         config = bandersnatch.configuration.BandersnatchConfig(config_path)
     except ConfigFileNotFound:
-        logger.warning(f"Config file '{args.config}' missing, creating default config.")
+        logger.warning(
+            "Config file '%s' missing, creating default config.", args.config
+        )
         logger.warning("Please review the config file, then run 'bandersnatch' again.")
         bandersnatch.configuration.create_example_config(config_path)
         return 1
@@ -224,7 +243,7 @@ def main(loop: asyncio.AbstractEventLoop | None = None) -> int:
 
     if loop:
         loop.set_debug(args.debug)
-    return asyncio.run(async_main(args, config))
+    return _run(async_main(args, config))
 
 
 if __name__ == "__main__":
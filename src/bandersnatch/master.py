@@ -1,9 +1,14 @@
 import asyncio
+import json
 import logging
+import random
 import sys
-from collections.abc import AsyncGenerator
+import warnings
+from collections.abc import AsyncIterator, Callable, Iterable
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from functools import partial
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -16,12 +21,36 @@ from bandersnatch.config.proxy import get_aiohttp_proxy_kwargs, proxy_address_fr
 from .errors import PackageNotFound
 from .utils import USER_AGENT
 
+# See if we have orjson and use it to parse package metadata if so
+json_loads: Callable[[str], Any]
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 if sys.version_info >= (3, 8) and sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 logger = logging.getLogger(__name__)
 FIVE_HOURS_FLOAT = 5 * 60 * 60.0
 PYPI_SERIAL_HEADER = "X-PYPI-LAST-SERIAL"
+ABSOLUTE_URL_PREFIXES = ("https://", "http://")
+CUSTOM_HEADERS = {"User-Agent": USER_AGENT}
+SKIP_HEADERS = frozenset({"User-Agent"})
+FETCH_CHUNK_SIZE = 1 << 20
+CONNECTIONS_PER_HOST = 64
+MAX_BACKOFF_SECONDS = 30
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75.0
+# Leaked SSL transports were fixed in CPython 3.12.8 and 3.13.1 - aiohttp warns
+# if enable_cleanup_closed is used on interpreters that no longer need it
+NEEDS_CLEANUP_CLOSED = sys.version_info < (3, 12, 8) or (
+    (3, 13, 0) <= sys.version_info < (3, 13, 1)
+)
+# Prepend bandersnatch info to aiohttp-xmlrpc's own USER_AGENT
+XMLRPC_USER_AGENT = f"bandersnatch {bandersnatch.__version__} {ServerProxy.USER_AGENT}"
 
 
 class StalePage(Exception):
@@ -32,6 +61,18 @@ class XmlRpcError(aiohttp.ClientError):
     """Issue getting package listing from PyPI Repository"""
 
 
+def is_retryable(exc: BaseException) -> bool:
+    """Transient network errors and upstream 5xx responses are worth retrying"""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500
+    return isinstance(exc, (TimeoutError, aiohttp.ClientConnectionError))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so parallel retries don't stampede PyPI"""
+    return min(2.0**attempt, MAX_BACKOFF_SECONDS) + random.random()
+
+
 class Master:
     def __init__(
         self,
@@ -41,9 +82,15 @@ class Master:
         proxy: str | None = None,
         allow_non_https: bool = False,
         allow_upstream_serial_mismatch: bool = False,
+        connections_per_host: int = CONNECTIONS_PER_HOST,
+        attempts: int = 3,
     ) -> None:
         self.url = url
+        # Master relative paths always start with a "/"
+        self._url_prefix = url.rstrip("/")
         self.timeout = timeout
+        self.connections_per_host = connections_per_host
+        self.attempts = attempts
         self.global_timeout = global_timeout or FIVE_HOURS_FLOAT
         self.allow_upstream_serial_mismatch = allow_upstream_serial_mismatch
 
@@ -60,32 +107,53 @@ class Master:
             logger.error(err)
             raise ValueError(err)
 
-        self.loop = asyncio.get_event_loop()
+        if self.attempts < 1:
+            err = f"Master attempts must be at least 1, got {attempts}"
+            logger.error(err)
+            raise ValueError(err)
 
     async def __aenter__(self) -> "Master":
         logger.debug("Initializing Master's aiohttp ClientSession")
-        custom_headers = {"User-Agent": USER_AGENT}
-        skip_headers = {"User-Agent"}
         aiohttp_timeout = aiohttp.ClientTimeout(
             total=self.global_timeout,
             sock_connect=self.timeout,
             sock_read=self.timeout,
         )
+        session_kwargs = dict(self.proxy_kwargs)
+        # A SOCKS proxy brings its own connector - otherwise keep connections
+        # to PyPI alive and pooled to avoid repeated TCP + TLS handshakes
+        if "connector" not in session_kwargs:
+            session_kwargs["connector"] = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.connections_per_host,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=NEEDS_CLEANUP_CLOSED,
+            )
         self.session = aiohttp.ClientSession(
-            headers=custom_headers,
-            skip_auto_headers=skip_headers,
+            headers=CUSTOM_HEADERS,
+            skip_auto_headers=SKIP_HEADERS,
             timeout=aiohttp_timeout,
             raise_for_status=True,
-            **self.proxy_kwargs,
+            **session_kwargs,
+        )
+        # Reuse one XML-RPC client bound to our session for every rpc() call
+        self._xmlrpc_client = ServerProxy(
+            self.xmlrpc_url,
+            client=self.session,
+            headers={"User-Agent": XMLRPC_USER_AGENT},
         )
         return self
 
     async def __aexit__(self, *exc: Any) -> None:
-        logger.debug("Closing Master's aiohttp ClientSession and waiting 0.1 seconds")
+        logger.debug("Closing Master's aiohttp ClientSession")
+        # The session owns its connector, so this also closes every pooled
+        # connection - and aborts leaked SSL transports when the interpreter
+        # needs it (see NEEDS_CLEANUP_CLOSED)
         await self.session.close()
-        # Give time for things to actually close to avoid warnings
+        # Yield once so the transports can finish closing and avoid warnings
         # https://github.com/aio-libs/aiohttp/issues/1115
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(0)
 
     async def check_for_stale_cache(
         self, path: str, required_serial: int | None, got_serial: int | None
@@ -105,18 +173,16 @@ class Master:
                     + "Report issue to PyPA Warehouse GitHub if it persists ..."
                 )
 
+    @asynccontextmanager
     async def get(
         self, path: str, required_serial: int | None, **kw: Any
-    ) -> AsyncGenerator[aiohttp.ClientResponse, None]:
-        logger.debug(f"Getting {path} (serial {required_serial})")
-        if not path.startswith(("https://", "http://")):
-            path = self.url + path
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        logger.debug("Getting %s (serial %s)", path, required_serial)
+        if not path.startswith(ABSOLUTE_URL_PREFIXES):
+            path = self._url_prefix + path
         async with self.session.get(path, **kw) as r:
-            got_serial = (
-                int(r.headers[PYPI_SERIAL_HEADER])
-                if PYPI_SERIAL_HEADER in r.headers
-                else None
-            )
+            raw_serial = r.headers.get(PYPI_SERIAL_HEADER)
+            got_serial = int(raw_serial) if raw_serial is not None else None
             await self.check_for_stale_cache(path, required_serial, got_serial)
             yield r
 
@@ -125,59 +191,80 @@ class Master:
         self,
         url: str,
         file_path: Path,
-        executor: ProcessPoolExecutor | ThreadPoolExecutor | None = None,
-        chunk_size: int = 65536,
+        executor: ThreadPoolExecutor | None = None,
+        chunk_size: int = FETCH_CHUNK_SIZE,
     ) -> None:
-        logger.info(f"Fetching {url}")
+        """Download `url` to `file_path`.
+
+        `executor` runs the blocking mkdir and file writes and defaults to
+        the event loop's default executor. It must be a thread pool: open file objects can't be
+        sent to a process pool, and a syscall is cheaper than the IPC anyway.
+        """
+        logger.info("Fetching %s", url)
 
-        await self.loop.run_in_executor(
+        if isinstance(executor, ProcessPoolExecutor):
+            warnings.warn(  # type: ignore[unreachable]
+                "url_fetch needs a ThreadPoolExecutor - using the default "
+                + "executor instead of the given ProcessPoolExecutor",
+                stacklevel=2,
+            )
+            executor = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
             executor, partial(file_path.parent.mkdir, parents=True, exist_ok=True)
         )
 
         async with self.session.get(url) as response:
-            with file_path.open("wb") as fd:
-                while True:
-                    chunk = await response.content.read(chunk_size)
-                    if not chunk:
-                        break
-                    fd.write(chunk)
+            # Keep blocking disk I/O off the event loop thread
+            fd = await loop.run_in_executor(executor, file_path.open, "wb")
+            # Double buffer: write one chunk while the next is read from the network
+            write: asyncio.Future[int] | None = None
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    if write:
+                        await write
+                    write = loop.run_in_executor(executor, fd.write, chunk)
+                if write:
+                    await write
+            finally:
+                if write and not write.done():
+                    await asyncio.wait([write])
+                await loop.run_in_executor(executor, fd.close)
 
     @property
     def xmlrpc_url(self) -> str:
-        return f"{self.url}/pypi"
-
-    # TODO: Potentially make USER_AGENT more accessible from aiohttp-xmlrpc
-    async def _gen_custom_headers(self) -> dict[str, str]:
-        # Create dummy client so we can copy the USER_AGENT + prepend bandersnatch info
-        dummy_client = ServerProxy(self.xmlrpc_url, loop=self.loop)
-        custom_headers = {
-            "User-Agent": (
-                f"bandersnatch {bandersnatch.__version__} {dummy_client.USER_AGENT}"
-            )
-        }
-        await dummy_client.close()
-        return custom_headers
-
-    async def _gen_xmlrpc_client(self) -> ServerProxy:
-        custom_headers = await self._gen_custom_headers()
-        client = ServerProxy(
-            self.xmlrpc_url,
-            client=self.session,
-            loop=self.loop,
-            headers=custom_headers,
-        )
-        return client
+        return f"{self._url_prefix}/pypi"
 
     # TODO: Add an async context manager to aiohttp-xmlrpc to replace this function
     async def rpc(self, method_name: str, serial: int = 0) -> Any:
-        try:
-            client = await self._gen_xmlrpc_client()
-            method = getattr(client, method_name)
-            if serial:
-                return await method(serial)
-            return await method()
-        except TimeoutError as te:
-            logger.error(f"Call to {method_name} @ {self.xmlrpc_url} timed out: {te}")
+        method = getattr(self._xmlrpc_client, method_name)
+        args = (serial,) if serial else ()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await method(*args)
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if attempt == self.attempts:
+                    if isinstance(e, TimeoutError):
+                        logger.error(
+                            "Call to %s @ %s timed out: %s",
+                            method_name,
+                            self.xmlrpc_url,
+                            e,
+                        )
+                        return None
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    "Call to %s @ %s failed: %r - attempt %d, retrying in %.1fs",
+                    method_name,
+                    self.xmlrpc_url,
+                    e,
+                    attempt,
+                    delay,
+                )
+                await asyncio.sleep(delay)
 
     async def all_packages(self) -> Any:
         all_packages_with_serial = await self.rpc("list_packages_with_serial")
@@ -190,19 +277,47 @@ class Master:
         if changelog is None:
             changelog = []
 
-        packages: dict[str, int] = {}
-        for package, _version, _time, _action, serial in changelog:
-            if serial > packages.get(package, 0):
-                packages[package] = serial
-        return packages
+        # Sorting by serial lets the highest serial per package win the dict
+        # build; the changelog is usually already ordered so this is ~O(n)
+        return {
+            package: serial
+            for package, _version, _time, _action, serial in sorted(
+                changelog, key=itemgetter(4)
+            )
+        }
 
     async def get_package_metadata(self, package_name: str, serial: int = 0) -> Any:
-        try:
-            metadata_generator = self.get(f"/pypi/{package_name}/json", serial)
-            metadata_response = await metadata_generator.asend(None)
-            metadata = await metadata_response.json()
-            return metadata
-        except aiohttp.ClientResponseError as e:
-            if e.status == 404:
-                raise PackageNotFound(package_name)
-            raise
+        # Timeouts and stale pages are retried by Package.update_metadata
+        for attempt in range(1, self.attempts + 1):
+            try:
+                async with self.get(f"/pypi/{package_name}/json", serial) as r:
+                    return await r.json(loads=json_loads)
+            except aiohttp.ClientResponseError as e:
+                if e.status == 404:
+                    raise PackageNotFound(package_name)
+                if e.status < 500 or attempt == self.attempts:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    "Got HTTP %d for %s metadata - attempt %d, retrying in %.1fs",
+                    e.status,
+                    package_name,
+                    attempt,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def gather_metadata(
+        self, names: Iterable[str], concurrency: int = 16
+    ) -> dict[str, Any]:
+        """Fetch the JSON metadata of many packages, at most `concurrency` at a time.
+
+        Errors are raised as from get_package_metadata, e.g. PackageNotFound.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(name: str) -> tuple[str, Any]:
+            async with semaphore:
+                return name, await self.get_package_metadata(name)
+
+        return dict(await asyncio.gather(*(fetch(name) for name in names)))
@@ -882,28 +882,30 @@ class BandersnatchMirror(Mirror):
         # and then maybe deleted. Re-uploading (and thus changing the hash)
         # is only allowed in extremely rare cases with intervention from the
         # PyPI admins.
-        r_generator = self.master.get(url, required_serial=None)
-        response = await r_generator.asend(None)
-
         checksum = hashlib.sha256()
 
-        with self.storage_backend.rewrite(path, "wb") as f:
-            while True:
-                chunk = await response.content.read(chunk_size)
-                if not chunk:
-                    break
-                checksum.update(chunk)
-                f.write(chunk)
-
-            existing_hash = checksum.hexdigest()
-            if existing_hash != sha256sum:
-                # Bad case: the file we got does not match the expected
-                # checksum. Even if this should be the rare case of a
-                # re-upload this will fix itself in a later run.
-                raise ValueError(
-                    f"Inconsistent file. {url} has hash {existing_hash} "
-                    + f"instead of {sha256sum}."
-                )
+        async with self.master.get(url, required_serial=None) as response:
+            with self.storage_backend.rewrite(path, "wb") as f:
+                while True:
+                    chunk = await response.content.read(chunk_size)
+                    if not chunk:
+                        break
+                    # hashlib drops the GIL for large buffers, so hash off the
+                    # event loop thread
+                    await loop.run_in_executor(
+                        self.storage_backend.executor, checksum.update, chunk
+                    )
+                    f.write(chunk)
+
+                existing_hash = checksum.hexdigest()
+                if existing_hash != sha256sum:
+                    # Bad case: the file we got does not match the expected
+                    # checksum. Even if this should be the rare case of a
+                    # re-upload this will fix itself in a later run.
+                    raise ValueError(
+                        f"Inconsistent file. {url} has hash {existing_hash} "
+                        + f"instead of {sha256sum}."
+                    )
 
         # set upload time to avoid downloading again in next sync
         self.storage_backend.set_upload_time(path, upload_time)
@@ -969,34 +971,51 @@ async def mirror(
             config_values.diff_append_epoch,
         )
 
-    mirror_url = config.get("mirror", "master")
-    allow_non_https = config.getboolean("mirror", "allow-non-https")
-    allow_upstream_serial_mismatch = config.getboolean("mirror", "allow-upstream-serial-mismatch", fallback=False)
-    timeout = config.getfloat("mirror", "timeout")
-    global_timeout = config.getfloat("mirror", "global-timeout", fallback=None)
-    proxy = config.get("mirror", "proxy", fallback=None)
+    mirror_config = config["mirror"]
+    mirror_url = mirror_config["master"]
+    allow_non_https = mirror_config.getboolean("allow-non-https")
+    allow_upstream_serial_mismatch = mirror_config.getboolean(
+        "allow-upstream-serial-mismatch", fallback=False
+    )
+    timeout = mirror_config.getfloat("timeout")
+    global_timeout = mirror_config.getfloat("global-timeout", fallback=None)
+    proxy = mirror_config.get("proxy", fallback=None)
+    stop_on_error = mirror_config.getboolean("stop-on-error")
+    workers = mirror_config.getint("workers")
+    hash_index = mirror_config.getboolean("hash-index")
+    # SectionProxy returns None rather than raising for a missing option
+    assert (
+        allow_non_https is not None
+        and timeout is not None
+        and stop_on_error is not None
+        and workers is not None
+        and hash_index is not None
+    ), "[mirror] is missing a required option"
     storage_backend = config_values.storage_backend_name
-    homedir = Path(config.get("mirror", "directory"))
+    homedir = Path(mirror_config["directory"])
 
     # Always reference those classes here with the fully qualified name to
     # allow them being patched by mock libraries!
     async with Master(
-        mirror_url, timeout, global_timeout, proxy, allow_non_https, allow_upstream_serial_mismatch
+        mirror_url,
+        timeout,
+        global_timeout,
+        proxy,
+        allow_non_https,
+        allow_upstream_serial_mismatch,
     ) as master:
         mirror = BandersnatchMirror(
             homedir,
             master,
             storage_backend=storage_backend,
-            stop_on_error=config.getboolean("mirror", "stop-on-error"),
-            workers=config.getint("mirror", "workers"),
-            hash_index=config.getboolean("mirror", "hash-index"),
+            stop_on_error=stop_on_error,
+            workers=workers,
+            hash_index=hash_index,
             json_save=config_values.json_save,
             root_uri=config_values.root_uri,
             digest_name=config_values.digest_name,
             compare_method=config_values.compare_method,
-            keep_index_versions=config.getint(
-                "mirror", "keep_index_versions", fallback=0
-            ),
+            keep_index_versions=mirror_config.getint("keep_index_versions", fallback=0),
             diff_append_epoch=config_values.diff_append_epoch,
             diff_full_path=diff_full_path,
             cleanup=config_values.cleanup,
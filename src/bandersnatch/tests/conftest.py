@@ -3,7 +3,7 @@ import os
 import unittest.mock as mock
 from asyncio import AbstractEventLoop
 from collections import defaultdict
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict
 
@@ -116,9 +116,9 @@ def package_json() -> dict[str, Any]:
     }
 
 
-# This requests the 'event_loop' fixture from pytest-asyncio because the initializer for
-# 'Master' uses `asyncio.get_event_loop()`, and in some contexts a loop won't already
-# exist when the fixture is initialized.
+# This requests the 'event_loop' fixture from pytest-asyncio because the initializers for
+# 'BandersnatchMirror' and the storage plugins built on top of this fixture use
+# `asyncio.get_event_loop()`, and in some contexts a loop won't already exist.
 @pytest.fixture
 def master(package_json: dict[str, Any], event_loop: AbstractEventLoop) -> "Master":
     from bandersnatch.master import Master
@@ -127,6 +127,10 @@ def master(package_json: dict[str, Any], event_loop: AbstractEventLoop) -> "Mast
         async def read(self, *args: Any) -> bytes:
             return b""
 
+        async def iter_chunked(self, *args: Any) -> AsyncIterator[bytes]:
+            for chunk in (b"abc", b"def", b"g69"):
+                yield chunk
+
     class FakeAiohttpClient:
         headers = {"X-PYPI-LAST-SERIAL": "1"}
 
@@ -140,7 +144,7 @@ def master(package_json: dict[str, Any], event_loop: AbstractEventLoop) -> "Mast
         def content(self) -> "FakeReader":
             return FakeReader()
 
-        async def json(self, *args: Any) -> dict[str, Any]:
+        async def json(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
             return package_json
 
     def session_side_effect(*args: Any, **kwargs: Any) -> Any:
@@ -10,10 +10,11 @@ import pytest
 from _pytest.capture import CaptureFixture
 from _pytest.logging import LogCaptureFixture
 
+import bandersnatch.main
 import bandersnatch.mirror
 import bandersnatch.storage
 from bandersnatch.configuration import Singleton
-from bandersnatch.main import main
+from bandersnatch.main import _make_parser, main
 from bandersnatch.simple import SimpleFormat
 
 if TYPE_CHECKING:
@@ -43,6 +44,18 @@ def test_main_help(capfd: CaptureFixture) -> None:
     assert "" == err
 
 
+def test_make_parser_is_cached() -> None:
+    assert _make_parser() is _make_parser()
+
+
+def test_run_falls_back_without_uvloop_run() -> None:
+    async def answer() -> int:
+        return 69
+
+    with mock.patch.dict(sys.modules, {"uvloop": object()}):
+        assert bandersnatch.main._run(answer()) == 69
+
+
 def test_main_create_config(caplog: LogCaptureFixture, tmpdir: Path) -> None:
     sys.argv = ["bandersnatch", "-c", str(tmpdir / "bandersnatch.conf"), "mirror"]
     assert main(asyncio.new_event_loop()) == 1
@@ -115,6 +128,25 @@ def test_main_reads_custom_config_values(
     assert log_config == ((customconfig / "bandersnatch-log.conf"),)
 
 
+def test_main_force_check_moves_status_file(
+    mirror_mock: mock.MagicMock,
+    logging_mock: mock.MagicMock,
+    customconfig: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    status_file = Path(customconfig) / "pypi" / "status"
+    status_file.parent.mkdir(parents=True)
+    status_file.write_text("69")
+    tmp_status_file = Path(customconfig) / "tmp" / "status"
+    tmp_status_file.parent.mkdir()
+    monkeypatch.setattr(bandersnatch.main, "TMP_STATUS_FILE", tmp_status_file)
+    conffile = str(customconfig / "bandersnatch.conf")
+    sys.argv = ["bandersnatch", "-c", conffile, "mirror", "--force-check"]
+    main(asyncio.new_event_loop())
+    assert not status_file.exists()
+    assert tmp_status_file.read_text() == "69"
+
+
 def test_main_throws_exception_on_unsupported_digest_name(
     customconfig: Path,
 ) -> None:
@@ -1,11 +1,13 @@
 import concurrent.futures
 from pathlib import Path
 from tempfile import gettempdir
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
 import pytest
 
 import bandersnatch
+from bandersnatch.errors import PackageNotFound
 from bandersnatch.master import Master, StalePage, XmlRpcError
 
 
@@ -15,6 +17,12 @@ async def test_disallow_http() -> None:
         Master("http://pypi.example.com")
 
 
+@pytest.mark.asyncio
+async def test_disallow_zero_attempts() -> None:
+    with pytest.raises(ValueError, match="attempts"):
+        Master("https://pypi.example.com", attempts=0)
+
+
 @pytest.mark.asyncio
 async def test_rpc_url(master: Master) -> None:
     assert master.xmlrpc_url == "https://pypi.example.com/pypi"
@@ -59,15 +67,31 @@ async def test_changed_packages_with_changes(master: Master) -> None:
 
 @pytest.mark.asyncio
 async def test_master_raises_if_serial_too_small(master: Master) -> None:
-    get_ag = master.get("/asdf", 10)
     with pytest.raises(StalePage):
-        await get_ag.asend(None)
+        async with master.get("/asdf", 10):
+            pass
 
 
 @pytest.mark.asyncio
 async def test_master_doesnt_raise_if_serial_equal(master: Master) -> None:
-    get_ag = master.get("/asdf", 1)
-    await get_ag.asend(None)
+    async with master.get("/asdf", 1) as r:
+        assert r.headers["X-PYPI-LAST-SERIAL"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_master_get_joins_relative_path(master: Master) -> None:
+    trailing_slash = Master("https://pypi.example.com/")
+    assert trailing_slash.xmlrpc_url == "https://pypi.example.com/pypi"
+    trailing_slash.session = master.session
+    async with trailing_slash.get("/pypi/foo/json", 1):
+        pass
+    async with trailing_slash.get("https://files.example.com/foo.whl", 1):
+        pass
+    session_get: Mock = master.session.get  # type: ignore
+    assert [c[0][0] for c in session_get.call_args_list] == [
+        "https://pypi.example.com/pypi/foo/json",
+        "https://files.example.com/foo.whl",
+    ]
 
 
 @pytest.mark.asyncio
@@ -76,12 +100,30 @@ async def test_master_url_fetch(master: Master) -> None:
     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as thread_pool:
         await master.url_fetch("https://unittest.org/asdf", fetch_path, thread_pool)
     assert master.session.get.called
+    assert fetch_path.read_bytes() == b"abcdefg69"
+
+
+@pytest.mark.asyncio
+async def test_master_url_fetch_rejects_process_pool(master: Master) -> None:
+    fetch_path = Path(gettempdir()) / "unittest_url_fetch"
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as process_pool:
+        with pytest.warns(UserWarning, match="ThreadPoolExecutor"):
+            await master.url_fetch(
+                "https://unittest.org/asdf", fetch_path, process_pool  # type: ignore
+            )
+    assert fetch_path.read_bytes() == b"abcdefg69"
 
 
 @pytest.mark.asyncio
 async def test_xmlrpc_user_agent(master: Master) -> None:
-    client = await master._gen_xmlrpc_client()
-    assert f"bandersnatch {bandersnatch.__version__}" in client.headers["User-Agent"]
+    with patch("aiohttp.ClientSession", autospec=True):
+        async with master:
+            client = master._xmlrpc_client
+            assert (
+                f"bandersnatch {bandersnatch.__version__}"
+                in client.headers["User-Agent"]
+            )
+            assert client.client is master.session
 
 
 @pytest.mark.asyncio
@@ -91,3 +133,84 @@ async def test_session_raise_for_status(master: Master) -> None:
             pass
         assert len(create_session.call_args_list) == 1
         assert create_session.call_args_list[0][1]["raise_for_status"]
+
+
+@pytest.mark.asyncio
+async def test_session_connector_pools_connections() -> None:
+    master = Master("https://pypi.example.com", connections_per_host=8)
+    with (
+        patch("aiohttp.ClientSession", autospec=True) as create_session,
+        patch("aiohttp.TCPConnector", autospec=True) as create_connector,
+    ):
+        async with master:
+            pass
+        assert create_connector.call_args_list[0][1]["limit_per_host"] == 8
+        assert (
+            create_session.call_args_list[0][1]["connector"]
+            is create_connector.return_value
+        )
+
+
+@pytest.mark.asyncio
+async def test_gather_metadata(master: Master) -> None:
+    async def fake_metadata(name: str) -> dict[str, str]:
+        if name == "missing":
+            raise PackageNotFound(name)
+        return {"name": name}
+
+    master.get_package_metadata = AsyncMock(side_effect=fake_metadata)  # type: ignore
+    metadata = await master.gather_metadata(["foo", "bar"], concurrency=1)
+    assert metadata == {"foo": {"name": "foo"}, "bar": {"name": "bar"}}
+    with pytest.raises(PackageNotFound):
+        await master.gather_metadata(["foo", "missing", "bar"], concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_rpc_retries_transient_errors() -> None:
+    master = Master("https://pypi.example.com")
+    master._xmlrpc_client = Mock()
+    master._xmlrpc_client.changelog_since_serial = AsyncMock(
+        side_effect=[TimeoutError(), aiohttp.ServerDisconnectedError(), [("foo",)]]
+    )
+    with patch("asyncio.sleep", new=AsyncMock()) as sleep:
+        assert await master.rpc("changelog_since_serial", 69) == [("foo",)]
+    master._xmlrpc_client.changelog_since_serial.assert_awaited_with(69)
+    assert sleep.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_rpc_gives_up_after_timeouts() -> None:
+    master = Master("https://pypi.example.com", attempts=2)
+    master._xmlrpc_client = Mock()
+    master._xmlrpc_client.list_packages_with_serial = AsyncMock(
+        side_effect=TimeoutError()
+    )
+    with patch("asyncio.sleep", new=AsyncMock()):
+        assert await master.rpc("list_packages_with_serial") is None
+    assert master._xmlrpc_client.list_packages_with_serial.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_package_metadata_retries_server_errors(master: Master) -> None:
+    server_error = aiohttp.ClientResponseError(
+        request_info=Mock(), history=(), status=503
+    )
+    session_get: Mock = master.session.get  # type: ignore
+    session_get.side_effect = [server_error, session_get.side_effect("/pypi/foo")]
+    with patch("asyncio.sleep", new=AsyncMock()) as sleep:
+        metadata = await master.get_package_metadata("foo")
+    assert metadata["info"]["name"] == "Foo"
+    assert sleep.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_package_metadata_does_not_retry_client_errors(
+    master: Master,
+) -> None:
+    session_get: Mock = master.session.get  # type: ignore
+    session_get.side_effect = aiohttp.ClientResponseError(
+        request_info=Mock(), history=(), status=403
+    )
+    with pytest.raises(aiohttp.ClientResponseError):
+        await master.get_package_metadata("foo")
+    assert session_get.call_count == 1
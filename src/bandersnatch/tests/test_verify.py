@@ -1,8 +1,10 @@
 import configparser
+import json
 import os
 import sys
 import unittest.mock as mock
 from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
 from pathlib import Path
 from shutil import rmtree
 from tempfile import gettempdir
@@ -333,5 +335,55 @@ async def test_verify_url_exception(tmp_path: Path, monkeypatch: MonkeyPatch) ->
     assert not all_package_files
 
 
+@pytest.mark.asyncio
+async def test_verify_rehashes_and_refetches_mismatch(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    class FakeArgs:
+        delete = False
+        dry_run = False
+        json_update = False
+        workers = 2
+
+    good_content = b"good package"
+    url = "https://unittests.org/packages/a0/a0/a0a0/package-1.0.0.tar.gz"
+    pkg_file = tmp_path / "web" / convert_url_to_path(url)
+    pkg_file.parent.mkdir(parents=True)
+    pkg_file.write_bytes(b"corrupt package")
+
+    jsonpath = tmp_path / "web" / "json"
+    jsonpath.mkdir(parents=True)
+    (jsonpath / "package").write_text(
+        json.dumps(
+            {
+                "info": {"name": "package"},
+                "releases": {
+                    "1.0.0": [
+                        {
+                            "url": url,
+                            "digests": {"sha256": sha256(good_content).hexdigest()},
+                        }
+                    ]
+                },
+            }
+        )
+    )
+
+    async def fetch_good(_: str, save_path: Path, *__: Any) -> None:
+        save_path.write_bytes(good_content)
+
+    master = Master(FakeConfig().get("mirror", "master"))
+    url_fetch = AsyncMock(side_effect=fetch_good)
+    monkeypatch.setattr(master, "url_fetch", url_fetch)
+    all_package_files: list[Path] = []
+
+    await verify(
+        master, FakeConfig(), "package", tmp_path, all_package_files, FakeArgs()  # type: ignore # noqa: E501
+    )
+    assert url_fetch.await_count == 1
+    assert pkg_file.read_bytes() == good_content
+    assert all_package_files == [pkg_file]
+
+
 if __name__ == "__main__":
     pytest.main(sys.argv)
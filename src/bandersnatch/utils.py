@@ -208,7 +208,7 @@ def parse_version(version: str) -> list[str]:
     _versions.extend(
         [
             tag_separator1
-            + INTERPRETER_SHORT_NAMES.get("python")
+            + INTERPRETER_SHORT_NAMES["python"]
             + _version_with_dot
             + tag_separator1
         ]
@@ -216,7 +216,7 @@ def parse_version(version: str) -> list[str]:
     _versions.extend(
         [
             tag_separator1
-            + INTERPRETER_SHORT_NAMES.get("python")
+            + INTERPRETER_SHORT_NAMES["python"]
             + _version_with_dot
             + tag_separator2
         ]